@@ -3,8 +3,12 @@
 import os
 import sys
 import re
-from typing import Dict, List, Tuple
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 
+# Listed in order of precedence: when a header matches several patterns, the first one here
+# wins, so LGPL beats GPL. Matches overlapping an earlier one are not seen, e.g. 'GPLGPL' is GPL.
 LICENSE_PATTERNS = {
     'MIT': r'MIT License|Permission is hereby granted, free of charge',
     'LGPL': r'GNU Lesser General Public License|LGPL',
@@ -14,29 +18,76 @@ LICENSE_PATTERNS = {
     'BSD': r'BSD License|Redistribution and use in source',
 }
 
-def find_source_files(src_dir: str) -> List[str]:
+# Single alternation compiled once at load, the named group that matched is the license type
+LICENSE_RE = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in LICENSE_PATTERNS.items()), re.IGNORECASE)
+LICENSE_PRECEDENCE = {name: rank for rank, name in enumerate(LICENSE_PATTERNS)}
+COPYRIGHT_RE = re.compile(r'copyright|©|\(c\)', re.IGNORECASE)
+
+# Characters read from each file, license headers are looked for only this far in
+HEADER_CHARS = 1000
+
+# Joins headers for the single-pass search, cannot occur inside any license match
+HEADER_SEPARATOR = '\x00SEP\x00'
+
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+SOURCE_EXTENSIONS = ('.h', '.hpp', '.cpp', '.c', '.pio')
+
+def find_source_files(src_dir: str) -> Iterator[str]:
     """Find all source files with specified extensions."""
-    source_files = []
-    for root, _, files in os.walk(src_dir):
-        for file in files:
-            if file.endswith(('.h', '.hpp', '.cpp', '.c', '.pio')):
-                source_files.append(os.path.join(root, file))
-    return source_files
+    subdirs = []
+    try:
+        entries = os.scandir(src_dir)
+    except OSError:
+        # Skip unreadable directories, like os.walk does
+        return
+    # DirEntry caches the file type from the directory read, saving a stat per entry
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.name.endswith(SOURCE_EXTENSIONS):
+                yield entry.path
+    # Same top-down order as os.walk: files of a directory before its subdirectories
+    for subdir in subdirs:
+        yield from find_source_files(subdir)
 
-def detect_license(content: str) -> Tuple[bool, str]:
-    """Detect license in file content. Returns (has_license, license_type)."""
-    # Look only in the first 1000 characters where license headers typically appear
-    header = content[:1000].lower()
+def detect_licenses(headers: List[str]) -> List[Tuple[bool, str]]:
+    """Detect licenses in file headers. Returns (has_license, license_type) for each header."""
+    # Look only in the first characters where license headers typically appear. All headers
+    # are joined into one buffer and searched in a single pass per regex; each match is mapped
+    # back to its header by offset.
+    headers = [header[:HEADER_CHARS] for header in headers]
+    offsets = []
+    position = 0
+    for header in headers:
+        offsets.append(position)
+        position += len(header) + len(HEADER_SEPARATOR)
+    buffer = HEADER_SEPARATOR.join(headers)
     
-    for license_type, pattern in LICENSE_PATTERNS.items():
-        if re.search(pattern.lower(), header):
-            return True, license_type
+    results = [(False, "")] * len(headers)
+    for match in LICENSE_RE.finditer(buffer):
+        index = bisect_right(offsets, match.start()) - 1
+        # Keep the highest-precedence license found in the header, not the leftmost one
+        has_license, license_type = results[index]
+        if not has_license or LICENSE_PRECEDENCE[match.lastgroup] < LICENSE_PRECEDENCE[license_type]:
+            results[index] = (True, match.lastgroup)
     
-    # Check for generic copyright notices
-    if re.search(r'copyright|©|\(c\)', header):
-        return True, "Copyright"
-        
-    return False, ""
+    # Check for generic copyright notices in headers without a license
+    for match in COPYRIGHT_RE.finditer(buffer):
+        index = bisect_right(offsets, match.start()) - 1
+        if not results[index][0]:
+            results[index] = (True, "Copyright")
+    
+    return results
+
+def read_header(file_path: str) -> Tuple[str, Optional[Exception]]:
+    """Read the header of a file. Returns (header, error)."""
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read(HEADER_CHARS), None
+    except Exception as e:
+        return "", e
 
 def check_licenses(src_dir: str, verbose: bool = False) -> Dict:
     """Check licenses in all source files."""
@@ -47,28 +98,31 @@ def check_licenses(src_dir: str, verbose: bool = False) -> Dict:
         'license_types': {}
     }
     
-    files = find_source_files(src_dir)
+    files = list(find_source_files(src_dir))
     stats['total_files'] = len(files)
     
-    for file_path in files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            has_license, license_type = detect_license(content)
-            rel_path = os.path.relpath(file_path, src_dir)
-            
-            if has_license:
-                stats['with_license'] += 1
-                stats['license_types'][license_type] = stats['license_types'].get(license_type, 0) + 1
-                if verbose:
-                    print(f"{rel_path}: {license_type}")
-            else:
-                stats['without_license'] += 1
-                print(f"{rel_path}: License Missing")
-                
-        except Exception as e:
-            print(f"Error processing {file_path}: {str(e)}", file=sys.stderr)
+    # Reads are I/O bound, so threads overlap them; results come back in submission order
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        headers = list(executor.map(read_header, files))
+    
+    licenses = iter(detect_licenses([header for header, error in headers if error is None]))
+    
+    for file_path, (_, error) in zip(files, headers):
+        if error is not None:
+            print(f"Error processing {file_path}: {str(error)}", file=sys.stderr)
+            continue
+        
+        has_license, license_type = next(licenses)
+        rel_path = os.path.relpath(file_path, src_dir)
+        
+        if has_license:
+            stats['with_license'] += 1
+            stats['license_types'][license_type] = stats['license_types'].get(license_type, 0) + 1
+            if verbose:
+                print(f"{rel_path}: {license_type}")
+        else:
+            stats['without_license'] += 1
+            print(f"{rel_path}: License Missing")
             
     return stats
 
@@ -1,17 +1,23 @@
 #!/usr/bin/env python3
 
-# Brute-force search for the required number 'x'
+import math
+
+# Search for the required number 'x'
 def find_number():
     min_value = 132000000
     max_value = 200000000
     divisor = 1000000
     multiplier = 44000
     result = False
-    for x in range(1, max_value // multiplier + 1):
+    # x * multiplier is divisible by divisor exactly when x is a multiple of step
+    step = divisor // math.gcd(multiplier, divisor)
+    # Smallest x with x * multiplier >= min_value, rounded up to a multiple of step
+    x_min = -(-min_value // multiplier)
+    x_start = -(-x_min // step) * step
+    for x in range(max(x_start, step), max_value // multiplier + 1, step):
         product = x * multiplier
-        if min_value <= product <= max_value and product % divisor == 0:
-            print(f"Found number: {x}, freq: {product}\n")
-            result = True
+        print(f"Found number: {x}, freq: {product}\n")
+        result = True
     return result
 
 result = find_number()
@@ -1,51 +1,65 @@
 import argparse
+import binascii
 
 def parse_intel_hex(file_path):
-    data = {}
+    # Returns the data records as (address, bytes) tuples in file order, plus the lowest
+    # and highest address they cover (None for both if the file has no data).
+    records = []
+    min_addr = None
+    max_addr = None
     extended_addr = 0
     with open(file_path, 'r') as f:
         for line in f:
             line = line.strip()
             if not line or line[0] != ':':
                 continue
-            # Parse record fields
-            byte_count = int(line[1:3], 16)
-            offset = int(line[3:7], 16)
-            record_type = int(line[7:9], 16)
-            data_field = line[9:9 + byte_count*2]
-            # checksum = int(line[9+byte_count*2:9+byte_count*2+2], 16)  # Not validating here
+            # Decode the whole record once: byte count, offset (2 bytes), record type, data, checksum
+            raw = bytes.fromhex(line[1:])
+            byte_count = raw[0]
+            offset = (raw[1] << 8) | raw[2]
+            record_type = raw[3]
+            payload = raw[4:4 + byte_count]
+            # checksum = raw[4 + byte_count]  # Not validating here
 
             if record_type == 0x04:
                 # Extended linear address record
                 if byte_count != 2:
                     raise ValueError("Invalid extended linear address record length")
-                extended_addr = int(data_field, 16)
+                extended_addr = (payload[0] << 8) | payload[1]
             elif record_type == 0x00:
                 # Data record
+                if byte_count == 0:
+                    continue
                 base_addr = (extended_addr << 16) + offset
-                for i in range(byte_count):
-                    byte_val = int(data_field[i*2:i*2+2], 16)
-                    data[base_addr + i] = byte_val
+                records.append((base_addr, payload))
+                end_addr = base_addr + byte_count - 1
+                if min_addr is None or base_addr < min_addr:
+                    min_addr = base_addr
+                if max_addr is None or end_addr > max_addr:
+                    max_addr = end_addr
             elif record_type == 0x01:
                 # End Of File record, stop processing this file.
                 break
             else:
                 # Other record types are skipped.
                 continue
-    return data
+    return records, min_addr, max_addr
+
+def compute_checksum(byte_count, offset, record_type, payload):
+    # Two's complement of the sum of all record bytes, payload is a bytes-like object.
+    return (-(byte_count + (offset >> 8) + (offset & 0xFF) + record_type + sum(payload))) & 0xFF
 
-def compute_checksum(byte_count, offset, record_type, data_bytes):
-    total = byte_count + ((offset >> 8) & 0xFF) + (offset & 0xFF) + record_type
-    total += sum(data_bytes)
-    checksum = ((~total + 1) & 0xFF)
-    return checksum
+def format_record(byte_count, offset, record_type, payload):
+    chksum = compute_checksum(byte_count, offset, record_type, payload)
+    return ":%02X%04X%02X%s%02X" % (
+        byte_count, offset, record_type, binascii.hexlify(payload).decode('ascii').upper(), chksum)
 
-def write_data_as_hex(merged_data, output_file):
+def write_data_as_hex(merged_data, min_addr, output_file):
+    # merged_data is a contiguous image starting at min_addr, gaps already zero-filled.
     if not merged_data:
         raise ValueError("No data to write")
 
-    min_addr = min(merged_data.keys())
-    max_addr = max(merged_data.keys())
+    max_addr = min_addr + len(merged_data) - 1
     current = min_addr
     last_ext_addr = None
     records = []
@@ -55,11 +69,8 @@ def write_data_as_hex(merged_data, output_file):
         byte_count = 2
         offset = 0
         record_type = 0x04
-        data_bytes = [(ext_addr >> 8) & 0xFF, ext_addr & 0xFF]
-        chksum = compute_checksum(byte_count, offset, record_type, data_bytes)
-        record = ":{:02X}{:04X}{:02X}{}{:02X}".format(
-            byte_count, offset, record_type, ''.join(f"{b:02X}" for b in data_bytes), chksum)
-        return record
+        payload = bytes(((ext_addr >> 8) & 0xFF, ext_addr & 0xFF))
+        return format_record(byte_count, offset, record_type, payload)
 
     # Write data records using 16 bytes per record.
     while current <= max_addr:
@@ -72,22 +83,15 @@ def write_data_as_hex(merged_data, output_file):
         offset = current & 0xFFFF
         # Determine chunk length until next 16-byte boundary or next extended change.
         chunk_len = min(16 - (offset % 16), max_addr - current + 1)
-        data_bytes = []
-        for i in range(chunk_len):
-            addr = current + i
-            # If gap, fill with zero.
-            data_bytes.append(merged_data.get(addr, 0))
-        chksum = compute_checksum(chunk_len, offset, 0x00, data_bytes)
-        record = ":{:02X}{:04X}{:02X}{}{:02X}".format(
-            chunk_len, offset, 0x00, ''.join(f"{b:02X}" for b in data_bytes), chksum)
-        records.append(record)
+        start = current - min_addr
+        payload = merged_data[start:start + chunk_len]
+        records.append(format_record(chunk_len, offset, 0x00, payload))
         current += chunk_len
 
     # End Of File record
     records.append(":00000001FF")
-    with open(output_file, 'w') as f:
-        for rec in records:
-            f.write(rec + "\n")
+    with open(output_file, 'w', newline='\n') as f:
+        f.write("\n".join(records) + "\n")
 
 def main():
     parser = argparse.ArgumentParser(
@@ -96,21 +100,32 @@ def main():
     parser.add_argument('-o', '--output', default='out.hex', help='Output HEX file')
     args = parser.parse_args()
 
-    merged_data = {}
+    records = []
+    min_addr = None
+    max_addr = None
 
-    # Merge data from each HEX file.
+    # Collect data records and the overall address range from each HEX file.
     for file in args.files:
         print(f"Processing file: {file}")
-        file_data = parse_intel_hex(file)
-        # Later files overwrite earlier ones on address conflicts.
-        merged_data.update(file_data)
+        file_records, file_min, file_max = parse_intel_hex(file)
+        if not file_records:
+            continue
+        records.extend(file_records)
+        min_addr = file_min if min_addr is None else min(min_addr, file_min)
+        max_addr = file_max if max_addr is None else max(max_addr, file_max)
 
-    if not merged_data:
+    if not records:
         print("No data found in input files.")
         return
 
-    print(f"Merging address range: 0x{min(merged_data.keys()):X} to 0x{max(merged_data.keys()):X}")
-    write_data_as_hex(merged_data, args.output)
+    # Merge into one zero-filled image, later records overwrite earlier ones on address conflicts.
+    merged_data = bytearray(max_addr - min_addr + 1)
+    for addr, payload in records:
+        start = addr - min_addr
+        merged_data[start:start + len(payload)] = payload
+
+    print(f"Merging address range: 0x{min_addr:X} to 0x{max_addr:X}")
+    write_data_as_hex(merged_data, min_addr, args.output)
     print(f"Output written to {args.output}")
 
 if __name__ == '__main__':
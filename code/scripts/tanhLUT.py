@@ -1,3 +1,5 @@
+import io
+
 import numpy as np
 
 # written by chatgpt 4o
@@ -16,19 +18,18 @@ FIXED_POINT_MAX = 1.0
 # Compute the step size for the input range
 input_step = (INPUT_MAX - INPUT_MIN) / (LUT_SIZE - 1)
 
-# Initialize the LUT array
-lut = np.zeros(LUT_SIZE, dtype=np.int16)
+# Compute all input values at once
+input_values = INPUT_MIN + np.arange(LUT_SIZE) * input_step
+
+# Scale from the fixed-point range to int16
+fixed_point_scale = 65535 / (FIXED_POINT_MAX - FIXED_POINT_MIN)
 
 # Fill the LUT with tanh values
-for i in range(LUT_SIZE):
-    # Compute the input value
-    input_value = INPUT_MIN + i * input_step
-    # Compute the tanh value
-    tanh_value = np.tanh(input_value)
-    # Map the tanh value to the fixed-point range
-    fixed_point_value = int((tanh_value - FIXED_POINT_MIN) / (FIXED_POINT_MAX - FIXED_POINT_MIN) * 65535 - 32768)
-    # Store the fixed-point value in the LUT
-    lut[i] = np.clip(fixed_point_value, -32768, 32767)
+tanh_values = np.tanh(input_values)
+# Map the tanh values to the fixed-point range and store them in the LUT (astype truncates
+# toward zero like int()). tanh is in (-1, 1), so the results stay within [-32767, 32766]
+# and need no clipping.
+lut = ((tanh_values - FIXED_POINT_MIN) * fixed_point_scale - 32768).astype(np.int16)
 
 # Save the LUT to a header file
 header_filename = "lookup_tanh.h"
@@ -40,15 +41,10 @@ with open(header_filename, 'w') as header_file:
     header_file.write("#define LUT_SIZE {}\n\n".format(LUT_SIZE))
     header_file.write("const int16_t tanh_lut[LUT_SIZE] = {\n")
     
-    # Write the LUT values
-    for i in range(LUT_SIZE):
-        header_file.write("    {}".format(lut[i]))
-        if i < LUT_SIZE - 1:
-            header_file.write(",")
-        if (i + 1) % 8 == 0:
-            header_file.write("\n")
-        else:
-            header_file.write(" ")
+    # Write the LUT values, 8 per line, formatted by NumPy in a single write
+    body = io.StringIO()
+    np.savetxt(body, lut.reshape(-1, 8), fmt="    %d", delimiter=", ", newline=",\n")
+    header_file.write(body.getvalue().rstrip(",\n") + "\n")
 
     header_file.write("\n};\n\n")
     header_file.write("#endif // TANH_LUT_H\n")